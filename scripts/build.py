@@ -5,16 +5,22 @@ import re
 import csv
 import json
 import html
-import time
 import math
 import random
 import hashlib
+import zlib
+import pickle
+import threading
+import http.client
+import functools
+import itertools
 import secrets
 import datetime as dt
 from pathlib import Path
-from urllib.parse import urlparse
-from urllib.request import Request, urlopen
-from urllib.error import URLError, HTTPError
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from urllib.parse import urlparse, urljoin
+from urllib.request import Request, urlopen, getproxies
+from urllib.error import HTTPError
 from xml.sax.saxutils import escape as xml_escape
 import xmlrpc.client
 
@@ -26,6 +32,7 @@ HISTORY_FILE = Path("data/history.csv")
 INDEXNOW_KEY_FILE = Path("data/indexnow.key")
 ENRICH_CACHE_FILE = Path("data/enriched.json")
 SITE_BLURB_CACHE_FILE = Path("data/site_blurbs.json")
+DAY_HASH_FILE = Path("data/day_hashes.json")
 
 # ---------------------------
 # Build outputs
@@ -35,6 +42,10 @@ DAILY_DIR = DOCS_DIR / "d"
 
 MAX_ALL_LIST = int(os.environ.get("MAX_ALL_LIST", "500"))
 MAX_RSS_ITEMS = int(os.environ.get("MAX_RSS_ITEMS", "200"))
+RENDER_WORKERS = int(os.environ.get("RENDER_WORKERS", "0")) or (os.cpu_count() or 1)
+RENDER_PARALLEL_MIN_DAYS = int(os.environ.get("RENDER_PARALLEL_MIN_DAYS", "32"))
+# treat URLs differing only in scheme/host case, default port or empty path as one
+CANONICALIZE_URLS = os.environ.get("CANONICALIZE_URLS", "1").strip() == "1"
 
 BASE_URL = os.environ.get("BASE_URL", "").strip().rstrip("/")
 ENABLE_INDEXNOW = os.environ.get("ENABLE_INDEXNOW", "1").strip() == "1"
@@ -50,7 +61,11 @@ ENABLE_AI = os.environ.get("ENABLE_AI", "0").strip() == "1"
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "").strip()
 GEMINI_MODEL = os.environ.get("GEMINI_MODEL", "gemini-2.5-flash").strip()
 ENRICH_TTL_DAYS = int(os.environ.get("ENRICH_TTL_DAYS", "14"))
+ENRICH_TTL_JITTER = float(os.environ.get("ENRICH_TTL_JITTER", "0.2"))  # +/- fraction of the TTL, per URL
 MAX_AI_CALLS = int(os.environ.get("MAX_AI_CALLS", "30"))
+AI_BATCH_SIZE = int(os.environ.get("AI_BATCH_SIZE", "8"))
+ENRICH_WORKERS = int(os.environ.get("ENRICH_WORKERS", "8"))
+AI_WORKERS = int(os.environ.get("AI_WORKERS", "4"))  # Gemini is rate-limited; keep its pool small
 
 # AI (site blurb)
 ENABLE_SITE_BLURB = os.environ.get("ENABLE_SITE_BLURB", "1").strip() == "1"
@@ -58,137 +73,294 @@ SITE_BLURB_TTL_DAYS = int(os.environ.get("SITE_BLURB_TTL_DAYS", "30"))
 
 UA = "Mozilla/5.0 (compatible; DiscoveryHub/1.0)"
 URL_RE = re.compile(r"^https?://", re.I)
+_WS_RE = re.compile(r"\s+")
+
+# page meta extraction works on raw bytes of the <head> slice
+_HEAD_END_RE = re.compile(rb"</head\s*>", re.I)
+# the title is lexed as open tag -> '>' -> close tag, so a page with many unclosed
+# <title> tags costs one linear scan instead of a backtracking search per tag
+_TITLE_OPEN_RE = re.compile(rb"<title", re.I)
+_TITLE_CLOSE_RE = re.compile(rb"</title>", re.I)
+# meta tags are lexed one at a time and their quoted attributes read in a single
+# pass; the lookbehind keeps attribute names from restarting inside a long run
+_META_OPEN_RE = re.compile(rb"<meta\b", re.I)
+_ATTR_RE = re.compile(rb'(?<![\w:.-])([\w:.-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+
+# json.dumps builds a fresh encoder whenever options are passed; reuse these
+_JSON = json.JSONEncoder(ensure_ascii=False)
+_json_str = json.encoder.encode_basestring  # C string quoting used by _JSON
+_JSON_COMPACT = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
 
 # ---------------------------
 # Time helpers
 # ---------------------------
+# "now" is sampled once per build so every page, feed and cache entry agrees
+BUILD_NOW = dt.datetime.now(dt.timezone.utc).replace(microsecond=0, tzinfo=None)
+BUILD_TODAY = BUILD_NOW.date().isoformat()
+BUILD_UTC_ISO_Z = BUILD_NOW.strftime("%Y-%m-%dT%H:%M:%SZ")
+BUILD_UTC_RFC2822 = BUILD_NOW.strftime("%a, %d %b %Y %H:%M:%S +0000")
+BUILD_UTC_DISPLAY = BUILD_NOW.strftime("%Y-%m-%d %H:%M:%S")  # pages, schema
+BUILD_UTC_ISO = BUILD_NOW.strftime("%Y-%m-%dT%H:%M:%S")  # sitemap lastmod, backlink feed (Z appended there)
+
 def utc_today_iso() -> str:
-    return dt.datetime.utcnow().date().isoformat()
+    return BUILD_TODAY
 
 def utc_now_iso_z() -> str:
-    return dt.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
-
-def utc_now_rfc2822() -> str:
-    return dt.datetime.utcnow().strftime("%a, %d %b %Y %H:%M:%S +0000")
+    return BUILD_UTC_ISO_Z
 
 # ---------------------------
 # IO helpers
 # ---------------------------
+# output directories already created this run; write_text skips mkdir for these
+_KNOWN_DIRS: set[Path] = set()
+
 def ensure_dirs():
     Path("data").mkdir(parents=True, exist_ok=True)
     DOCS_DIR.mkdir(parents=True, exist_ok=True)
     DAILY_DIR.mkdir(parents=True, exist_ok=True)
+    _KNOWN_DIRS.update((DOCS_DIR, DAILY_DIR))
 
-def write_text(path: Path, content: str):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content, encoding="utf-8", newline="\n")
+def _same_content(path: Path, bufs: list[bytes], size: int) -> bool:
+    # cheap size check first; only same-sized files are read back and compared
+    try:
+        if os.stat(path).st_size != size:
+            return False
+        old = memoryview(path.read_bytes())
+    except OSError:
+        return False
+    off = 0
+    for b in bufs:
+        if old[off : off + len(b)] != b:
+            return False
+        off += len(b)
+    return True
+
+def _ensure_parent(path: Path):
+    parent = path.parent
+    if parent not in _KNOWN_DIRS:
+        parent.mkdir(parents=True, exist_ok=True)
+        _KNOWN_DIRS.add(parent)
+
+def _tmp_sibling(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+def write_parts(path: Path, parts) -> bool:
+    # returns False when the file already held exactly this content
+    _ensure_parent(path)
+    # parts already use "\n"; hand the encoded pieces to one gather write
+    # instead of concatenating them into a single string first
+    bufs = [p.encode("utf-8") for p in parts]
+    if _same_content(path, bufs, sum(map(len, bufs))):
+        return False
+    # write a sibling temp file and swap it in, so a crash never leaves a torn file
+    tmp = _tmp_sibling(path)
+    try:
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            n = os.writev(fd, bufs) if len(bufs) > 1 else 0
+            # regular files take the whole vector at once; finish any short write by hand
+            for b in bufs:
+                if n >= len(b):
+                    n -= len(b)
+                    continue
+                data = memoryview(b)[n:]
+                n = 0
+                while data:
+                    data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return True
+
+def write_text(path: Path, content: str) -> bool:
+    return write_parts(path, (content,))
+
+def stream_write(path: Path, chunks):
+    # write chunks as they are produced instead of joining one big string first;
+    # a 64 KiB buffer keeps the many short XML lines to a few write syscalls
+    _ensure_parent(path)
+    # same temp file + swap as write_parts, so readers never see a half-written feed
+    tmp = _tmp_sibling(path)
+    try:
+        with tmp.open("w", encoding="utf-8", newline="\n", buffering=1 << 16) as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
 
 def ensure_nojekyll():
     write_text(DOCS_DIR / ".nojekyll", "")
 
 def normalize_url(u: str) -> str:
-    u = (u or "").strip()
-    u = re.sub(r"\s+", "", u)
-    return u
+    # str.split() uses the same whitespace set as \s, without the regex engine
+    return "".join((u or "").split())
 
 def read_input_urls() -> list[str]:
     if not DATA_FILE.exists():
         return []
-    lines = DATA_FILE.read_text(encoding="utf-8", errors="ignore").splitlines()
     urls: list[str] = []
-    for i, raw in enumerate(lines):
-        s = raw.strip()
-        if not s:
-            continue
-        if i == 0 and s.lower() == "url":
-            continue
+    # stream lines instead of holding the whole file and its splitlines() copy
+    with DATA_FILE.open("r", encoding="utf-8", errors="ignore") as f:
+        for i, raw in enumerate(f):
+            s = raw.strip()
+            if not s:
+                continue
+            if i == 0 and s.lower() == "url":
+                continue
 
-        # tolerate old format: YYYY-MM-DD,https://...
-        if "," in s and not URL_RE.match(s):
-            parts = [p.strip() for p in s.split(",") if p.strip()]
-            if parts and URL_RE.match(parts[-1]):
-                s = parts[-1]
+            # tolerate old format: YYYY-MM-DD,https://...
+            if "," in s and not URL_RE.match(s):
+                parts = [p.strip() for p in s.split(",") if p.strip()]
+                if parts and URL_RE.match(parts[-1]):
+                    s = parts[-1]
 
-        if URL_RE.match(s):
-            urls.append(s)
+            if URL_RE.match(s):
+                urls.append(s)
     return urls
 
+_DEFAULT_PORTS = {"http": ":80", "https": ":443"}
+
+def url_key(u: str) -> str:
+    # identity key for dedupe: only the RFC 3986 equivalences that never change the
+    # resource (query order and fragments can matter to the target site, so they stay)
+    if not CANONICALIZE_URLS or not URL_RE.match(u):
+        return u
+    i = u.find("://")
+    scheme = u[:i].lower()
+    rest = u[i + 3:]
+    end = len(rest)
+    for ch in "/?#":
+        j = rest.find(ch)
+        if 0 <= j < end:
+            end = j
+    userinfo, at, host = rest[:end].rpartition("@")
+    host = host.lower()
+    if host.endswith(_DEFAULT_PORTS[scheme]):
+        host = host[: -len(_DEFAULT_PORTS[scheme])]
+    tail = rest[end:]
+    if not tail.startswith("/"):
+        tail = "/" + tail
+    return f"{scheme}://{userinfo}{at}{host}{tail}"
+
 def dedupe_preserve_order(urls: list[str]) -> list[str]:
-    seen = set()
-    out = []
-    for u in urls:
-        nu = normalize_url(u)
-        if not nu:
-            continue
-        if nu in seen:
-            continue
-        seen.add(nu)
-        out.append(nu)
-    return out
+    if not CANONICALIZE_URLS:
+        return list(dict.fromkeys(filter(None, map(normalize_url, urls))))
+    # first spelling wins; later equivalents are dropped
+    seen: dict[str, str] = {}
+    for u in filter(None, map(normalize_url, urls)):
+        seen.setdefault(url_key(u), u)
+    return list(seen.values())
 
 def read_history() -> list[tuple[str, str]]:
     if not HISTORY_FILE.exists():
         return []
+    # plain "date,url" lines; only rows quoted by csv.writer need the csv parser
+    text = HISTORY_FILE.read_text(encoding="utf-8")
     rows: list[tuple[str, str]] = []
-    with HISTORY_FILE.open("r", encoding="utf-8", newline="") as f:
-        r = csv.reader(f)
-        for row in r:
-            if not row or len(row) < 2:
-                continue
-            d = (row[0] or "").strip()
-            u = (row[1] or "").strip()
-            if d and u:
-                rows.append((d, u))
+    for line in text.splitlines():
+        if not line:
+            continue
+        row = next(csv.reader([line]), []) if '"' in line else line.split(",", 2)
+        if len(row) < 2:
+            continue
+        d = (row[0] or "").strip()
+        u = (row[1] or "").strip()
+        if d and u:
+            rows.append((d, u))
     return rows
 
-def write_history(rows: list[tuple[str, str]]):
-    with HISTORY_FILE.open("w", encoding="utf-8", newline="") as f:
-        w = csv.writer(f)
-        for d, u in rows:
-            w.writerow([d, u])
+def _csv_field(v: str) -> str:
+    # same minimal quoting csv.writer applies
+    if any(ch in v for ch in ',"\r\n'):
+        return '"' + v.replace('"', '""') + '"'
+    return v
+
+def _history_text(rows: list[tuple[str, str]]) -> str:
+    return "".join(f"{_csv_field(d)},{_csv_field(u)}\r\n" for d, u in rows)
+
+def append_history(rows: list[tuple[str, str]]):
+    # history only grows, so add the new rows instead of rewriting the file
+    data = _history_text(rows).encode("utf-8")
+    with HISTORY_FILE.open("a+b") as f:
+        if f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) not in (b"\n", b"\r"):
+                # a hand-edited file may lack its final newline
+                data = b"\r\n" + data
+        f.write(data)
 
 def update_history_with_today(input_urls: list[str], today: str) -> list[tuple[str, str]]:
     history = read_history()
-    existing = set(u for _, u in history)
+    existing = set(url_key(u) for _, u in history)
 
-    changed = False
+    new_rows: list[tuple[str, str]] = []
     for u in input_urls:
-        if u in existing:
+        k = url_key(u)
+        if k in existing:
             continue
-        history.append((today, u))
-        existing.add(u)
-        changed = True
+        new_rows.append((today, u))
+        existing.add(k)
 
-    if changed:
-        write_history(history)
+    if new_rows:
+        append_history(new_rows)
+        history.extend(new_rows)
     return history
 
 def group_by_date(history: list[tuple[str, str]]) -> dict[str, list[str]]:
-    grouped: dict[str, list[str]] = {}
+    grouped: dict[str, dict[str, None]] = {}
     for d, u in history:
-        grouped.setdefault(d, []).append(u)
-    return grouped
+        grouped.setdefault(d, {})[u] = None
+    # a hand-edited history.csv may repeat a row; list each URL once per day
+    return {d: list(us) for d, us in grouped.items()}
 
+# unbounded: each URL is looked up several times per build in the same
+# history order, which a bounded LRU smaller than the history would always miss
+@functools.lru_cache(maxsize=None)
 def host_and_path(u: str) -> tuple[str, str]:
-    try:
-        p = urlparse(u)
-        host = p.netloc or ""
-        path = p.path or "/"
-        if p.query:
-            path = path + "?" + p.query
-        return host, path
-    except Exception:
-        return "", ""
-
+    # string-op equivalent of urlparse netloc / path?query for http(s) URLs;
+    # anything else (or bracketed IPv6 hosts) still goes through urlparse
+    if not URL_RE.match(u) or "[" in u or "]" in u:
+        try:
+            p = urlparse(u)
+            path = p.path or "/"
+            return p.netloc or "", (path + "?" + p.query) if p.query else path
+        except Exception:
+            return "", ""
+    rest = u[u.find("://") + 3:].partition("#")[0]
+    end = len(rest)
+    for ch in "/?":
+        j = rest.find(ch)
+        if 0 <= j < end:
+            end = j
+    host = rest[:end]
+    path, _, query = rest[end:].partition("?")
+    j = path.find(";", path.rfind("/"))
+    if j >= 0:
+        # urlparse splits ;params off the last segment
+        path = path[:j]
+    path = path or "/"
+    return host, (path + "?" + query) if query else path
+
+@functools.lru_cache(maxsize=512)
 def abs_url(path: str) -> str:
     p = path if path.startswith("/") else ("/" + path)
     if not BASE_URL:
         return p.lstrip("/")
     return f"{BASE_URL}{p}"
 
+def root_url(path: str, rel_prefix: str = "") -> str:
+    # abs_url for a file at the site root; without BASE_URL that is relative to
+    # docs/, so pages one level down (d/) pass rel_prefix="../" to reach it
+    u = abs_url(path)
+    return u if BASE_URL else rel_prefix + u
+
 # ---------------------------
 # Deterministic variation per site + per cloud
 # ---------------------------
+@functools.lru_cache(maxsize=256)
 def _seed_int(*parts: str) -> int:
     s = "|".join([p for p in parts if p is not None])
     h = hashlib.sha256(s.encode("utf-8")).hexdigest()
@@ -215,29 +387,21 @@ def pick_featured(items: list[str], n: int, scope: str) -> list[str]:
 # ---------------------------
 # Theme (unique color system)
 # ---------------------------
+# per 60-degree hue sector: indices into (c, x, 0) for r, g, b
+_HSL_SECTORS = ((0, 1, 2), (1, 0, 2), (2, 0, 1), (2, 1, 0), (1, 2, 0), (0, 2, 1))
+
 def _hsl_to_hex(h: float, s: float, l: float) -> str:
     # h: 0..360, s/l: 0..1
     c = (1 - abs(2 * l - 1)) * s
     x = c * (1 - abs(((h / 60.0) % 2) - 1))
     m = l - c / 2
-    r = g = b = 0.0
-    if 0 <= h < 60:
-        r, g, b = c, x, 0
-    elif 60 <= h < 120:
-        r, g, b = x, c, 0
-    elif 120 <= h < 180:
-        r, g, b = 0, c, x
-    elif 180 <= h < 240:
-        r, g, b = 0, x, c
-    elif 240 <= h < 300:
-        r, g, b = x, 0, c
-    else:
-        r, g, b = c, 0, x
-    r = int(round((r + m) * 255))
-    g = int(round((g + m) * 255))
-    b = int(round((b + m) * 255))
-    return "#{:02x}{:02x}{:02x}".format(max(0, min(255, r)), max(0, min(255, g)), max(0, min(255, b)))
+    pal = (c, x, 0.0)
+    i, j, k = _HSL_SECTORS[min(int(h // 60.0), 5)]
+    return "#{:02x}{:02x}{:02x}".format(
+        *(max(0, min(255, int(round((pal[n] + m) * 255)))) for n in (i, j, k))
+    )
 
+@functools.lru_cache(maxsize=1)
 def theme_vars() -> dict:
     base_seed = _seed_int(BASE_URL, SITE_VARIANT, "theme")
     # create stable hue from seed, then nudge by variant
@@ -293,6 +457,8 @@ def theme_vars() -> dict:
 # ---------------------------
 # Schema
 # ---------------------------
+_LIST_ITEM_JSON = '{"@type": "ListItem", "position": %d, "url": %s}'
+
 def itemlist_schema(title: str, urls: list[str], built_utc: str) -> str:
     schema = {
         "@context": "https://schema.org",
@@ -300,13 +466,13 @@ def itemlist_schema(title: str, urls: list[str], built_utc: str) -> str:
         "name": title,
         "description": f"Curated list updated on {built_utc} UTC",
         "numberOfItems": len(urls),
-        "itemListElement": [
-            {"@type": "ListItem", "position": i, "url": u}
-            for i, u in enumerate(urls, start=1)
-        ],
     }
-    return json.dumps(schema, ensure_ascii=False)
+    # the list items are fixed-shape, so format them directly instead of building a
+    # dict per URL; same bytes as encoding them inside the schema dict
+    items = ", ".join([_LIST_ITEM_JSON % (i, _json_str(u)) for i, u in enumerate(urls, start=1)])
+    return f'{_JSON.encode(schema)[:-1]}, "itemListElement": [{items}]}}'
 
+@functools.lru_cache(maxsize=1)
 def website_schema() -> str:
     data = {
         "@context": "https://schema.org",
@@ -314,77 +480,208 @@ def website_schema() -> str:
         "name": SITE_NAME,
         "url": (BASE_URL or "").strip() or None,
     }
-    return json.dumps({k: v for k, v in data.items() if v is not None}, ensure_ascii=False)
+    return _JSON.encode({k: v for k, v in data.items() if v is not None})
 
 # ---------------------------
-# HTTP helpers (Gemini + IndexNow)
+# HTTP helpers (Gemini + IndexNow + page fetch)
 # ---------------------------
+# keep-alive connections, one set per thread (the enrich pool posts from workers)
+_CONN_LOCAL = threading.local()
+
+def _pooled_conn(scheme: str, host: str, timeout: float) -> tuple[dict, http.client.HTTPConnection, bool]:
+    pool = getattr(_CONN_LOCAL, "conns", None)
+    if pool is None:
+        pool = _CONN_LOCAL.conns = {}
+    conn = pool.get((scheme, host))
+    reused = conn is not None
+    if conn is None:
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        conn = pool[(scheme, host)] = cls(host, timeout=timeout)
+    else:
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+    return pool, conn, reused
+
+# what a kept-alive socket the server already closed raises before any reply
+# arrives; only then is resending a request safe
+_STALE_CONN_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
 def _http_post_json(url: str, payload: dict, headers: dict, timeout: float = 18.0) -> tuple[int, str]:
-    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
-    req = Request(url, data=data, method="POST")
-    req.add_header("Content-Type", "application/json")
-    req.add_header("User-Agent", UA)
-    for k, v in (headers or {}).items():
-        req.add_header(k, v)
+    data = _JSON.encode(payload).encode("utf-8")
     try:
-        with urlopen(req, timeout=timeout) as resp:
-            body = resp.read().decode("utf-8", errors="ignore")
-            return int(getattr(resp, "status", 200)), body
-    except HTTPError as e:
-        try:
-            body = e.read().decode("utf-8", errors="ignore")
-        except Exception:
-            body = ""
-        return int(e.code), body
-    except URLError as e:
-        return 0, str(e)
+        p = urlparse(url)
     except Exception as e:
         return 0, str(e)
-
-def _http_get(url: str, timeout: float = 12.0) -> tuple[int, str]:
-    req = Request(url, method="GET")
-    req.add_header("User-Agent", UA)
-    try:
-        with urlopen(req, timeout=timeout) as resp:
-            body = resp.read().decode("utf-8", errors="ignore")
-            return int(getattr(resp, "status", 200)), body
-    except HTTPError as e:
+    scheme = (p.scheme or "").lower()
+    if scheme not in ("http", "https") or not p.netloc:
+        return 0, f"unsupported URL: {url}"
+    if getproxies() or "@" in p.netloc:
+        # keep-alive pool unless a proxy or userinfo needs urllib's handlers
+        req = Request(url, data=data, method="POST")
+        req.add_header("Content-Type", "application/json")
+        req.add_header("User-Agent", UA)
+        for k, v in (headers or {}).items():
+            req.add_header(k, v)
         try:
-            body = e.read().decode("utf-8", errors="ignore")
-        except Exception:
-            body = ""
-        return int(e.code), body
-    except Exception as e:
-        return 0, str(e)
+            with urlopen(req, timeout=timeout) as resp:
+                return int(getattr(resp, "status", 200)), resp.read().decode("utf-8", errors="ignore")
+        except HTTPError as e:
+            try:
+                body = e.read().decode("utf-8", errors="ignore")
+            except Exception:
+                body = ""
+            return int(e.code), body
+        except Exception as e:
+            return 0, str(e)
+
+    path = (p.path or "/") + ("?" + p.query if p.query else "")
+    hdrs = {"Content-Type": "application/json", "User-Agent": UA, "Connection": "keep-alive"}
+    hdrs.update(headers or {})
+
+    while True:
+        pool, conn, reused = _pooled_conn(scheme, p.netloc, timeout)
+        try:
+            try:
+                conn.request("POST", path, body=data, headers=hdrs)
+                resp = conn.getresponse()
+            except _STALE_CONN_ERRORS:
+                if not reused:
+                    raise
+                # the server dropped the idle socket; resend once on a fresh one
+                conn.close()
+                pool.pop((scheme, p.netloc), None)
+                continue
+            body = resp.read().decode("utf-8", errors="ignore")
+            if resp.will_close:
+                conn.close()
+                pool.pop((scheme, p.netloc), None)
+            return int(resp.status), body
+        except Exception as e:
+            # timeouts and errors after the request went out are not retried
+            conn.close()
+            pool.pop((scheme, p.netloc), None)
+            return 0, str(e)
+
+_REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+def _is_markup(ctype: str) -> bool:
+    # no header means unknown, so still read it
+    ctype = ctype.lower()
+    return not ctype or "html" in ctype or "xml" in ctype
+
+_READ_CHUNK = 16384
+
+def _read_head(resp, limit: int) -> bytes:
+    # stream the body only until </head> turns up (or limit bytes), inflating gzip
+    # on the fly; a short remainder is drained so a keep-alive socket stays usable
+    gz = None
+    if (resp.getheader("Content-Encoding") or "").strip().lower() == "gzip":
+        gz = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    buf = bytearray()
+    while len(buf) < limit:
+        chunk = resp.read(_READ_CHUNK)
+        if not chunk:
+            break
+        if gz is not None:
+            try:
+                chunk = gz.decompress(chunk, limit - len(buf))
+            except zlib.error:
+                break
+        start = max(0, len(buf) - 16)
+        buf += chunk
+        if _HEAD_END_RE.search(buf, start):
+            if resp.length is not None and resp.length <= _READ_CHUNK:
+                resp.read()
+            break
+    return bytes(buf[:limit])
+
+def _http_get_pooled(url: str, headers: dict, timeout: float, limit: int, markup_only: bool = False) -> tuple[int, bytes, str]:
+    # GET over the per-thread keep-alive pool, following redirects like urlopen;
+    # non-2xx raises HTTPError as urlopen would. Returns (status, body up to </head>
+    # or limit bytes, content-type); with markup_only a non-HTML/XML body is left unread
+    for _ in range(10):
+        p = urlparse(url)
+        scheme = (p.scheme or "").lower()
+        if scheme not in ("http", "https") or not p.netloc:
+            raise ValueError(f"unsupported URL: {url}")
+        path = (p.path or "/") + (";" + p.params if p.params else "") + ("?" + p.query if p.query else "")
+        hdrs = {"User-Agent": UA, "Connection": "keep-alive"}
+        hdrs.update(headers)
+        while True:
+            pool, conn, reused = _pooled_conn(scheme, p.netloc, timeout)
+            try:
+                try:
+                    conn.request("GET", path, headers=hdrs)
+                    resp = conn.getresponse()
+                except _STALE_CONN_ERRORS:
+                    if not reused:
+                        raise
+                    # the server dropped the idle socket; resend once on a fresh one
+                    conn.close()
+                    pool.pop((scheme, p.netloc), None)
+                    continue
+                status = int(resp.status)
+                redirect = status in _REDIRECT_CODES and resp.getheader("Location")
+                ctype = resp.getheader("Content-Type") or ""
+                skip = redirect or status >= 300 or (markup_only and not _is_markup(ctype))
+                raw = b"" if skip else _read_head(resp, limit)
+                # only a fully consumed response leaves the socket reusable
+                if resp.will_close or not resp.isclosed():
+                    conn.close()
+                    pool.pop((scheme, p.netloc), None)
+                break
+            except Exception:
+                # timeouts and errors after the request went out are not retried
+                conn.close()
+                pool.pop((scheme, p.netloc), None)
+                raise
+        if redirect:
+            url = urljoin(url, redirect)
+            continue
+        if status < 200 or status >= 300:
+            raise HTTPError(url, status, resp.reason, resp.msg, None)
+        return status, raw, ctype
+    raise HTTPError(url, status, "too many redirects", resp.msg, None)
 
 def _days_old(utc_z: str) -> int:
     try:
         t = dt.datetime.strptime(utc_z, "%Y-%m-%dT%H:%M:%SZ")
-        return (dt.datetime.utcnow() - t).days
+        return (BUILD_NOW - t).days
     except Exception:
         return 999999
 
+def _jittered_ttl(key: str, ttl_days: int) -> float:
+    # stable per-key spread, so entries fetched in one burst expire over several builds
+    h = int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=2).digest(), "big")
+    return ttl_days * (1.0 + ENRICH_TTL_JITTER * (2.0 * h / 0xFFFF - 1.0))
+
 # ---------------------------
 # URL enrichment cache (kept, improved prompt)
 # ---------------------------
+_ENRICH_CACHE: dict | None = None
+
 def _load_enrich_cache() -> dict:
-    if not ENRICH_CACHE_FILE.exists():
-        return {"version": 1, "items": {}}
-    try:
-        return json.loads(ENRICH_CACHE_FILE.read_text(encoding="utf-8", errors="ignore"))
-    except Exception:
-        return {"version": 1, "items": {}}
+    # parsed once per process; later callers share the same dict
+    global _ENRICH_CACHE
+    if _ENRICH_CACHE is not None:
+        return _ENRICH_CACHE
+    cache = {"version": 1, "items": {}}
+    if ENRICH_CACHE_FILE.exists():
+        try:
+            cache = json.loads(ENRICH_CACHE_FILE.read_text(encoding="utf-8", errors="ignore"))
+        except Exception:
+            pass
+    _ENRICH_CACHE = cache
+    return cache
 
 def _save_enrich_cache(cache: dict):
-    ENRICH_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    ENRICH_CACHE_FILE.write_text(
-        json.dumps(cache, ensure_ascii=False, indent=2) + "\n",
-        encoding="utf-8",
-        newline="\n",
-    )
+    global _ENRICH_CACHE
+    write_text(ENRICH_CACHE_FILE, _JSON_COMPACT.encode(cache) + "\n")
+    _ENRICH_CACHE = cache
 
 def _guess_kind(url: str) -> str:
-    host = (urlparse(url).netloc or "").lower()
+    host = host_and_path(url)[0].lower()
     if "youtube.com" in host or "youtu.be" in host:
         return "video"
     if "soundcloud.com" in host:
@@ -401,34 +698,79 @@ def _guess_kind(url: str) -> str:
         return "profile"
     return "website"
 
+def _find_title(raw: bytes) -> bytes | None:
+    # same first match as <title[^>]*>(.*?)</title> (re.I | re.S), in linear time
+    m = _TITLE_OPEN_RE.search(raw)
+    if not m:
+        return None
+    start = raw.find(b">", m.end())
+    if start < 0:
+        return None
+    end = _TITLE_CLOSE_RE.search(raw, start + 1)
+    if not end:
+        return None
+    return raw[start + 1 : end.start()]
+
+def _find_meta_description(raw: bytes) -> bytes | None:
+    # first <meta name="description" content="..."> in either attribute order
+    pos = 0
+    while True:
+        m = _META_OPEN_RE.search(raw, pos)
+        if not m:
+            return None
+        end = raw.find(b">", m.end())
+        tag = raw[m.end() : end] if end >= 0 else raw[m.end() :]
+        # most meta tags (charset, og:*, viewport) never mention it; skip them unparsed
+        if b"description" in tag.lower():
+            name = content = None
+            for key, dq, sq in _ATTR_RE.findall(tag):
+                key = key.lower()
+                if key == b"name" and name is None:
+                    name = (dq or sq).strip().lower()
+                elif key == b"content" and content is None:
+                    content = dq or sq
+            if name == b"description" and content is not None:
+                return content
+        if end < 0:
+            return None
+        pos = end + 1
+
+_FETCH_ACCEPT = "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+_FETCH_HEADERS = {"Accept": _FETCH_ACCEPT, "Accept-Encoding": "gzip"}
+
 def _fetch_basic_meta(url: str, timeout: float = 12.0) -> dict:
-    req = Request(url, method="GET")
-    req.add_header("User-Agent", UA)
-    req.add_header("Accept", "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8")
     try:
-        with urlopen(req, timeout=timeout) as resp:
-            status = int(getattr(resp, "status", 200))
-            raw = resp.read(220_000)
-            ctype = (resp.headers.get("Content-Type") or "").lower()
+        # keep-alive pool unless a proxy or userinfo needs urllib's handlers
+        if getproxies() or "@" in host_and_path(url)[0]:
+            req = Request(url, method="GET")
+            req.add_header("User-Agent", UA)
+            for k, v in _FETCH_HEADERS.items():
+                req.add_header(k, v)
+            with urlopen(req, timeout=timeout) as resp:
+                status = int(getattr(resp, "status", 200))
+                ctype = resp.headers.get("Content-Type") or ""
+                # PDFs, images and archives carry no <title>; don't download them
+                raw = _read_head(resp, 220_000) if _is_markup(ctype) else b""
+        else:
+            status, raw, ctype = _http_get_pooled(url, _FETCH_HEADERS, timeout, 220_000, markup_only=True)
+        ctype = ctype.lower()
     except Exception as e:
         return {"http_status": 0, "error": str(e), "title": "", "description": "", "content_type": ""}
 
-    try:
-        text = raw.decode("utf-8", errors="ignore")
-    except Exception:
-        text = raw.decode("latin-1", errors="ignore")
+    # only scan the <head>; fall back to the whole read if it is not closed
+    m = _HEAD_END_RE.search(raw)
+    if m:
+        raw = raw[: m.end()]
 
     title = ""
-    m = re.search(r"<title[^>]*>(.*?)</title>", text, re.I | re.S)
-    if m:
-        title = html.unescape(re.sub(r"\s+", " ", m.group(1)).strip())
+    raw_title = _find_title(raw)
+    if raw_title is not None:
+        title = html.unescape(_WS_RE.sub(" ", raw_title.decode("utf-8", errors="ignore")).strip())
 
     desc = ""
-    m = re.search(r'<meta[^>]+name=["\']description["\'][^>]*content=["\'](.*?)["\']', text, re.I | re.S)
-    if not m:
-        m = re.search(r'<meta[^>]+content=["\'](.*?)["\'][^>]*name=["\']description["\']', text, re.I | re.S)
-    if m:
-        desc = html.unescape(re.sub(r"\s+", " ", m.group(1)).strip())
+    raw_desc = _find_meta_description(raw)
+    if raw_desc is not None:
+        desc = html.unescape(_WS_RE.sub(" ", raw_desc.decode("utf-8", errors="ignore")).strip())
 
     return {
         "http_status": status,
@@ -437,21 +779,25 @@ def _fetch_basic_meta(url: str, timeout: float = 12.0) -> dict:
         "content_type": ctype[:120],
     }
 
-def _gemini_json(prompt: str) -> dict:
+def _gemini_request(prompt: str, max_tokens: int = 340) -> str | None:
+    # raw body of a 2xx reply; None when the call itself failed (transport, 429, 5xx)
     if not GEMINI_API_KEY:
-        return {}
+        return None
     endpoint = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:generateContent"
     payload = {
         "contents": [{"parts": [{"text": prompt}]}],
         "generationConfig": {
             "temperature": 0.35,
-            "maxOutputTokens": 340,
+            "maxOutputTokens": max_tokens,
             "responseMimeType": "application/json",
         },
     }
     status, body = _http_post_json(endpoint, payload, headers={"x-goog-api-key": GEMINI_API_KEY}, timeout=18.0)
     if status < 200 or status >= 300:
-        return {}
+        return None
+    return body
+
+def _gemini_parse(body: str):
     try:
         obj = json.loads(body)
         txt = (
@@ -461,28 +807,30 @@ def _gemini_json(prompt: str) -> dict:
             .get("text", "")
         ).strip()
         if not txt:
-            return {}
-        out = json.loads(txt)
-        return out if isinstance(out, dict) else {}
+            return None
+        return json.loads(txt)
     except Exception:
-        return {}
+        return None
 
-def _gemini_summary(url: str, kind: str, title: str, description: str) -> dict:
-    prompt = (
-        "You write short neutral directory summaries for a link hub.\n"
-        "Rules:\n"
-        "- Neutral, factual tone. No hype words.\n"
-        "- Do not claim official, verified, guaranteed.\n"
-        "- Summary: 2 to 3 short sentences, max 360 characters.\n"
-        "- Title: max 120 characters.\n"
-        "- topics: 1 to 5 items, short.\n"
-        "- Return only JSON with keys: title, summary, topics.\n\n"
-        f"URL: {url}\n"
-        f"Type: {kind}\n"
-        f"Title signal: {title}\n"
-        f"Description signal: {description}\n"
-    )
-    out = _gemini_json(prompt)
+def _gemini_generate(prompt: str, max_tokens: int = 340):
+    body = _gemini_request(prompt, max_tokens)
+    return None if body is None else _gemini_parse(body)
+
+def _gemini_json(prompt: str) -> dict:
+    out = _gemini_generate(prompt)
+    return out if isinstance(out, dict) else {}
+
+_SUMMARY_RULES = (
+    "You write short neutral directory summaries for a link hub.\n"
+    "Rules:\n"
+    "- Neutral, factual tone. No hype words.\n"
+    "- Do not claim official, verified, guaranteed.\n"
+    "- Summary: 2 to 3 short sentences, max 360 characters.\n"
+    "- Title: max 120 characters.\n"
+    "- topics: 1 to 5 items, short.\n"
+)
+
+def _clean_summary(out: dict, title: str) -> dict:
     t = (out.get("title") or title or "").strip()[:120]
     s = (out.get("summary") or "").strip()[:380]
     topics = out.get("topics") or []
@@ -493,68 +841,151 @@ def _gemini_summary(url: str, kind: str, title: str, description: str) -> dict:
         return {}
     return {"title": t, "summary": s, "topics": topics}
 
+# Gemini requests left for URL summaries this run; batches and their per-URL
+# fallbacks draw from it across the AI pool's threads. enrich_urls refills it
+_AI_CALLS_LOCK = threading.Lock()
+_AI_CALLS_LEFT = 0
+
+def _take_ai_call() -> bool:
+    global _AI_CALLS_LEFT
+    with _AI_CALLS_LOCK:
+        if _AI_CALLS_LEFT <= 0:
+            return False
+        _AI_CALLS_LEFT -= 1
+        return True
+
+def _gemini_summary(url: str, kind: str, title: str, description: str) -> dict | None:
+    # None when no usable reply came back (budget spent, transport or HTTP failure)
+    if not _take_ai_call():
+        return None
+    prompt = (
+        _SUMMARY_RULES
+        + "- Return only JSON with keys: title, summary, topics.\n\n"
+        f"URL: {url}\n"
+        f"Type: {kind}\n"
+        f"Title signal: {title}\n"
+        f"Description signal: {description}\n"
+    )
+    body = _gemini_request(prompt)
+    if body is None:
+        return None
+    out = _gemini_parse(body)
+    return _clean_summary(out if isinstance(out, dict) else {}, title)
+
+def _gemini_summary_batch(items: list[dict]) -> list[dict]:
+    # items: {url, kind, title, description}; one result per item, in order
+    if len(items) == 1:
+        it = items[0]
+        return [_gemini_summary(it["url"], it["kind"], it["title"], it["description"]) or {}]
+    if not _take_ai_call():
+        return [{} for _ in items]
+
+    blocks = []
+    for n, it in enumerate(items, start=1):
+        blocks.append(
+            f"{n}. URL: {it['url']}\n"
+            f"Type: {it['kind']}\n"
+            f"Title signal: {it['title']}\n"
+            f"Description signal: {it['description']}\n"
+        )
+    prompt = (
+        _SUMMARY_RULES
+        + "- Return only a JSON array of objects with keys: title, summary, topics.\n"
+        "- One object per input below, in the same order.\n\n"
+        + "\n".join(blocks)
+    )
+    body = _gemini_request(prompt, max_tokens=340 * len(items))
+    if body is None:
+        # rate limited or unreachable: asking again per URL would only add load
+        return [{} for _ in items]
+    out = _gemini_parse(body)
+    if not isinstance(out, list) or len(out) != len(items):
+        # a reply that is not one object per input; ask per URL while budget lasts
+        results = []
+        for it in items:
+            one = _gemini_summary(it["url"], it["kind"], it["title"], it["description"])
+            if one is None:
+                break
+            results.append(one)
+        return results + [{} for _ in items[len(results):]]
+    return [_clean_summary(o if isinstance(o, dict) else {}, it["title"]) for o, it in zip(out, items)]
+
+def _fetch_entry(u: str) -> dict:
+    basic = _fetch_basic_meta(u)
+    return {
+        "url": u,
+        "kind": _guess_kind(u),
+        "http_status": int(basic.get("http_status") or 0),
+        "title": (basic.get("title") or "").strip()[:180],
+        "description": (basic.get("description") or "").strip()[:320],
+        "summary": "",
+        "topics": [],
+        "fetched_utc": utc_now_iso_z(),
+    }
+
+def _summarize_batch(entries: list[dict]) -> None:
+    results = _gemini_summary_batch(
+        [{k: e[k] for k in ("url", "kind", "title", "description")} for e in entries]
+    )
+    for out, ai in zip(entries, results):
+        if ai:
+            out["title"] = (ai.get("title") or out["title"] or "").strip()[:180]
+            out["summary"] = (ai.get("summary") or "").strip()[:420]
+            out["topics"] = ai.get("topics") or []
+
 def enrich_urls(target_urls: list[str]) -> dict[str, dict]:
+    global _AI_CALLS_LEFT
     cache = _load_enrich_cache()
-    items = cache.get("items") or {}
+    items = cache.get("items")
     if not isinstance(items, dict):
         items = {}
         cache["items"] = items
 
-    ai_calls_left = MAX_AI_CALLS
-
+    stale: list[str] = []
     for u in target_urls:
         if not URL_RE.match(u):
             continue
 
-        kind = _guess_kind(u)
         cur = items.get(u) or {}
         fetched_utc = (cur.get("fetched_utc") or "").strip()
 
         needs_refresh = True
         if fetched_utc:
-            needs_refresh = _days_old(fetched_utc) >= ENRICH_TTL_DAYS
-
-        if not needs_refresh:
-            continue
-
-        basic = _fetch_basic_meta(u)
-        title = (basic.get("title") or "").strip()
-        desc = (basic.get("description") or "").strip()
-
-        out = {
-            "url": u,
-            "kind": kind,
-            "http_status": int(basic.get("http_status") or 0),
-            "title": title[:180],
-            "description": desc[:320],
-            "summary": "",
-            "topics": [],
-            "fetched_utc": utc_now_iso_z(),
-        }
-
-        if ENABLE_AI and GEMINI_API_KEY and ai_calls_left > 0:
-            ai_calls_left -= 1
-            ai = _gemini_summary(u, kind, title, desc)
-            if ai:
-                out["title"] = (ai.get("title") or out["title"] or "").strip()[:180]
-                out["summary"] = (ai.get("summary") or "").strip()[:420]
-                out["topics"] = ai.get("topics") or []
-
+            needs_refresh = _days_old(fetched_utc) >= _jittered_ttl(u, ENRICH_TTL_DAYS)
+
+        if needs_refresh:
+            stale.append(u)
+
+    if not stale:
+        return items
+
+    # network bound: fetch in parallel, bounded by ENRICH_WORKERS
+    workers = max(1, min(ENRICH_WORKERS, len(stale)))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        fetched = list(ex.map(_fetch_entry, stale))
+
+    # MAX_AI_CALLS counts Gemini requests, per-URL fallbacks included; each batch
+    # carries up to AI_BATCH_SIZE URLs.
+    # a separate, smaller pool keeps concurrent calls under the API rate limit
+    if ENABLE_AI and GEMINI_API_KEY:
+        _AI_CALLS_LEFT = MAX_AI_CALLS
+        batch = max(1, AI_BATCH_SIZE)
+        ai_targets = fetched[: MAX_AI_CALLS * batch]
+        batches = [ai_targets[i:i + batch] for i in range(0, len(ai_targets), batch)]
+        if batches:
+            with ThreadPoolExecutor(max_workers=max(1, min(AI_WORKERS, len(batches)))) as ex:
+                list(ex.map(_summarize_batch, batches))
+
+    for out in fetched:
         # fallback if AI off or empty
         if not out["summary"]:
-            if desc:
-                out["summary"] = desc[:360]
-            elif title:
-                out["summary"] = title[:260]
-            else:
-                out["summary"] = ""
-
-        items[u] = out
-
-        # small polite delay when AI is on
-        if ENABLE_AI and GEMINI_API_KEY:
-            time.sleep(0.08)
+            if out["description"]:
+                out["summary"] = out["description"][:360]
+            elif out["title"]:
+                out["summary"] = out["title"][:260]
+        items[out["url"]] = out
 
+    # only rewrite the cache when an entry was actually refreshed
     cache["generated_utc"] = utc_now_iso_z()
     _save_enrich_cache(cache)
     return items
@@ -571,12 +1002,7 @@ def _load_site_blurb_cache() -> dict:
         return {"version": 1, "items": {}}
 
 def _save_site_blurb_cache(cache: dict):
-    SITE_BLURB_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    SITE_BLURB_CACHE_FILE.write_text(
-        json.dumps(cache, ensure_ascii=False, indent=2) + "\n",
-        encoding="utf-8",
-        newline="\n",
-    )
+    write_text(SITE_BLURB_CACHE_FILE, _JSON_COMPACT.encode(cache) + "\n")
 
 def _fallback_site_blurb() -> dict:
     label = SITE_VARIANT or "site"
@@ -615,7 +1041,7 @@ def get_site_blurb() -> dict:
         return _fallback_site_blurb()
 
     cache = _load_site_blurb_cache()
-    items = cache.get("items") or {}
+    items = cache.get("items")
     if not isinstance(items, dict):
         items = {}
         cache["items"] = items
@@ -641,12 +1067,69 @@ def get_site_blurb() -> dict:
     _save_site_blurb_cache(cache)
     return fb
 
+# ---------------------------
+# Daily page change detection
+# ---------------------------
+def _load_day_hashes() -> dict:
+    if not DAY_HASH_FILE.exists():
+        return {"version": 1, "items": {}}
+    try:
+        return json.loads(DAY_HASH_FILE.read_text(encoding="utf-8", errors="ignore"))
+    except Exception:
+        return {"version": 1, "items": {}}
+
+def _save_day_hashes(cache: dict):
+    write_text(DAY_HASH_FILE, _JSON_COMPACT.encode(cache) + "\n")
+
+@functools.lru_cache(maxsize=1)
+def _template_hash() -> str:
+    # any edit to this script or the theme invalidates every stored day hash
+    h = hashlib.blake2b(digest_size=16)
+    h.update(Path(__file__).read_bytes())
+    h.update(f"{BASE_URL}|{SITE_NAME}|{_seed_int(BASE_URL, SITE_VARIANT, 'theme')}".encode("utf-8"))
+    return h.hexdigest()
+
+def day_page_hash(day: str, day_urls: list[str], enrich: dict[str, dict], site_blurb: dict) -> str:
+    # BUILD_NONCE is left out on purpose: it only reshuffles display order,
+    # and including it would make every page look changed on every run
+    h = hashlib.blake2b(digest_size=16)
+    h.update(_template_hash().encode("utf-8"))
+    h.update((day + "|" + "|".join(day_urls)).encode("utf-8"))
+    h.update(_JSON.encode([enrich.get(u) for u in day_urls]).encode("utf-8"))
+    h.update(_JSON.encode([site_blurb.get("blurb"), site_blurb.get("meta_description")]).encode("utf-8"))
+    return h.hexdigest()
+
 # ---------------------------
 # Rendering helpers
 # ---------------------------
 def esc(s: str) -> str:
     return html.escape(s or "", quote=True)
 
+# build-invariant values, escaped once instead of on every page
+_ESC_SITE_NAME = esc(SITE_NAME)
+_ESC_SITE_VARIANT = esc(SITE_VARIANT)
+_ESC_HOME_URL = esc(abs_url("/"))
+_ESC_ALL_URL = esc(abs_url("/all.html"))
+_ESC_SITEMAP_URL = esc(abs_url("/sitemap.xml"))
+_ESC_RSS_URL = esc(abs_url("/rss.xml"))
+_ESC_ROBOTS_URL = esc(abs_url("/robots.txt"))
+_ESC_ABOUT_URL = esc(abs_url("/about.html"))
+_ESC_STATUS_URL = esc(abs_url("/status.html"))
+
+@functools.lru_cache(maxsize=4)
+def _esc_styles_url(rel_prefix: str) -> str:
+    return esc(root_url("/styles.css", rel_prefix))
+
+_NAV_HTML = (
+    f"<div class='navlinks'>"
+    f"<a href='{_ESC_ALL_URL}'>all</a>"
+    f"<a href='{_ESC_SITEMAP_URL}'>sitemap</a>"
+    f"<a href='{_ESC_RSS_URL}'>rss</a>"
+    f"<a href='{_ESC_ABOUT_URL}'>about</a>"
+    f"<a href='{_ESC_STATUS_URL}'>status</a>"
+    f"</div>"
+)
+
 def render_topics(topics: list[str]) -> str:
     if not topics:
         return ""
@@ -658,6 +1141,7 @@ def render_topics(topics: list[str]) -> str:
         chips.append(f"<span class='chip'>{tt}</span>")
     return "<div class='chips'>" + "".join(chips) + "</div>" if chips else ""
 
+@functools.lru_cache(maxsize=1)
 def page_css() -> str:
     tv = theme_vars()
     return f"""
@@ -885,7 +1369,7 @@ def page_css() -> str:
     .navlinks a:hover {{ text-decoration: underline; }}
     """
 
-def render_head(title: str, canonical: str, meta_description: str, schema_json: str, extra_schema_json: str = "") -> str:
+def render_head(title: str, canonical: str, meta_description: str, schema_json: str, extra_schema_json: str = "", rel_prefix: str = "") -> str:
     sd = (meta_description or "").strip()
     if not sd:
         sd = f"{SITE_NAME} lists recently added links with simple summaries."
@@ -903,146 +1387,220 @@ def render_head(title: str, canonical: str, meta_description: str, schema_json:
   <meta property="og:type" content="website" />
   <script type="application/ld+json">{schema_json}</script>
   <script type="application/ld+json">{extra_schema_json or website_schema()}</script>
-  <style>{page_css()}</style>
+  <link rel="stylesheet" href="{_esc_styles_url(rel_prefix)}" />
 </head>
 """
 
 def render_top_meta(url_count: int, built_utc: str, today_path: str, site_base: str) -> str:
-    nav = (
-        f"<div class='navlinks'>"
-        f"<a href='{esc(abs_url('/all.html'))}'>all</a>"
-        f"<a href='{esc(abs_url('/sitemap.xml'))}'>sitemap</a>"
-        f"<a href='{esc(abs_url('/rss.xml'))}'>rss</a>"
-        f"<a href='{esc(abs_url('/about.html'))}'>about</a>"
-        f"<a href='{esc(abs_url('/status.html'))}'>status</a>"
-        f"</div>"
-    )
     return (
         f"<div class='topbar'>"
-        f"<h1>{esc(SITE_NAME)}</h1>"
-        f"<div class='subtle'>{esc(SITE_VARIANT or '')}</div>"
+        f"<h1>{_ESC_SITE_NAME}</h1>"
+        f"<div class='subtle'>{_ESC_SITE_VARIANT}</div>"
         f"</div>"
-        f"{nav}"
+        f"{_NAV_HTML}"
         f"<div class='meta'>"
         f"<span class='badge'>URLs: <strong style='color:var(--text)'>{url_count}</strong></span>"
         f"<span class='badge'>Built: <strong style='color:var(--text)'>{esc(built_utc)} UTC</strong></span>"
         f"<span class='badge'><a href='{esc(abs_url('/' + today_path))}'>d/{esc(today_path.split('/')[-1])}</a></span>"
-        f"<span class='badge'><a href='{esc(abs_url('/sitemap.xml'))}'>sitemap.xml</a></span>"
-        f"<span class='badge'><a href='{esc(abs_url('/rss.xml'))}'>rss.xml</a></span>"
-        f"<span class='badge'><a href='{esc(abs_url('/robots.txt'))}'>robots.txt</a></span>"
+        f"<span class='badge'><a href='{_ESC_SITEMAP_URL}'>sitemap.xml</a></span>"
+        f"<span class='badge'><a href='{_ESC_RSS_URL}'>rss.xml</a></span>"
+        f"<span class='badge'><a href='{_ESC_ROBOTS_URL}'>robots.txt</a></span>"
         f"</div>"
     )
 
-def render_feature_cards(featured_urls: list[str], enrich: dict[str, dict]) -> str:
+def _preescape_one(u: str, e: dict) -> dict:
+    host, path = host_and_path(u)
+    title = (e.get("title") or "").strip()
+    summ = (e.get("summary") or "").strip()
+    topics = e.get("topics") or []
+    if not isinstance(topics, list):
+        topics = []
+    return {
+        "esc_u": esc(u),
+        "esc_host": esc(host),
+        "esc_path": esc(path),
+        "esc_kind": esc((e.get("kind") or "").strip()),
+        "esc_fetched": esc((e.get("fetched_utc") or "").strip()),
+        "esc_card_title": esc((title or u)[:120]),
+        "esc_card_summ": esc(summ[:300]),
+        "esc_title": esc(title[:180]),
+        "esc_summ": esc(summ[:420]),
+        "has_meta": bool(title or summ),
+        "chips": render_topics([str(x) for x in topics]) if topics else "",
+    }
+
+def preescape_enrich(all_urls: list[str], enrich: dict[str, dict]) -> dict[str, dict]:
+    # everything the renderers print for a URL, escaped and truncated once per build
+    return {u: _preescape_one(u, enrich.get(u) or {}) for u in all_urls}
+
+def render_feature_cards(featured_urls: list[str], pre: dict[str, dict]) -> str:
     cards = []
     for u in featured_urls:
-        e = enrich.get(u) or {}
-        title = (e.get("title") or "").strip() or u
-        summ = (e.get("summary") or "").strip()
-        kind = (e.get("kind") or "").strip()
-        topics = e.get("topics") or []
-        if not isinstance(topics, list):
-            topics = []
-        chips = render_topics([str(x) for x in topics]) if topics else ""
+        r = pre.get(u) or _preescape_one(u, {})
         cards.append(
             f"<div class='fcard'>"
-            f"<div class='f-title'><a href='{esc(u)}' target='_blank' rel='noopener'>{esc(title[:120])}</a></div>"
-            f"<div class='f-summ'>{esc(summ[:300])}</div>"
-            f"{chips}"
-            f"<div class='f-url'>{esc(kind)} | {esc(u)}</div>"
+            f"<div class='f-title'><a href='{r['esc_u']}' target='_blank' rel='noopener'>{r['esc_card_title']}</a></div>"
+            f"<div class='f-summ'>{r['esc_card_summ']}</div>"
+            f"{r['chips']}"
+            f"<div class='f-url'>{r['esc_kind']} | {r['esc_u']}</div>"
             f"</div>"
         )
     if not cards:
         return ""
     return "<div class='featured'>" + "".join(cards) + "</div>"
 
-def render_table(urls: list[str], enrich: dict[str, dict]) -> str:
-    rows = []
-    n = 0
+# render_table fragments; the row loop only appends the variable pieces
+_TABLE_HEAD = (
+    "<div class='controls'>"
+    "<div class='search'><input id='q' type='search' placeholder='Filter by host, title, or URL' autocomplete='off' /></div>"
+    "<div class='hint'>Type to filter the list</div>"
+    "</div>"
+    "<div class='table-wrap'>"
+    "<table>"
+    "<thead><tr><th>#</th><th>URL</th><th>Host</th><th>Path</th></tr></thead>"
+    "<tbody>"
+)
+
+@functools.lru_cache(maxsize=4)
+def _table_tail(rel_prefix: str) -> str:
+    return f"</tbody></table></div><script src='{esc(root_url('/filter.js', rel_prefix))}' defer></script>"
+
+# table filter, shipped once as docs/filter.js instead of inline on every page
+FILTER_JS = (
+    "const q=document.getElementById('q');"
+    "function norm(s){return (s||'').toLowerCase();}"
+    "q.addEventListener('input',()=>{"
+    "const v=norm(q.value);"
+    "const rows=[...document.querySelectorAll('tr.data-row')];"
+    "for(const r of rows){"
+    "const txt=norm(r.innerText);"
+    "const show = !v || txt.includes(v);"
+    "r.style.display = show ? '' : 'none';"
+    "let nxt=r.nextElementSibling;"
+    "if(nxt && nxt.classList.contains('meta-row')) nxt.style.display = show ? '' : 'none';"
+    "}"
+    "});\n"
+)
+_ROW_OPEN = "<tr class='data-row'><td class='num'>"
+_ROW_URL = "</td><td class='url'><a href='"
+_ROW_URL_TEXT = "' target='_blank' rel='noopener'>"
+_ROW_HOST = "</a></td><td class='host'>"
+_ROW_PATH = "</td><td class='path'>"
+_ROW_CLOSE = "</td></tr>"
+_META_OPEN = "<tr class='meta-row'><td class='num'></td><td colspan='3'><div class='u-meta'><div class='u-title'>"
+_META_SUMM = "</div><div class='u-summ'>"
+_META_EXTRA = "<div class='u-extra'>"
+_META_CLOSE = "</div></div></td></tr>"
+
+def render_table(urls: list[str], pre: dict[str, dict], rel_prefix: str = "") -> str:
+    parts = [_TABLE_HEAD]
+    add = parts.append
     for idx, u in enumerate(urls, start=1):
-        host, path = host_and_path(u)
-        rows.append(
-            f"<tr class='data-row'>"
-            f"<td class='num'>{idx}</td>"
-            f"<td class='url'><a href='{esc(u)}' target='_blank' rel='noopener'>{esc(u)}</a></td>"
-            f"<td class='host'>{esc(host)}</td>"
-            f"<td class='path'>{esc(path)}</td>"
-            f"</tr>"
-        )
-        e = enrich.get(u) or {}
-        title = (e.get("title") or "").strip()
-        summ = (e.get("summary") or "").strip()
-        kind = (e.get("kind") or "").strip()
-        fetched = (e.get("fetched_utc") or "").strip()
-        topics = e.get("topics") or []
-        if not isinstance(topics, list):
-            topics = []
-
-        if title or summ:
-            chips = render_topics([str(x) for x in topics]) if topics else ""
-            rows.append(
-                f"<tr class='meta-row'>"
-                f"<td class='num'></td>"
-                f"<td colspan='3'>"
-                f"<div class='u-meta'>"
-                f"<div class='u-title'>{esc(title[:180])}</div>"
-                f"<div class='u-summ'>{esc(summ[:420])}</div>"
-                f"{chips}"
-                f"<div class='u-extra'>{esc(kind)}"
-                + (f" | {esc(fetched)}" if fetched else "")
-                + f"</div>"
-                f"</div>"
-                f"</td>"
-                f"</tr>"
-            )
-        n += 1
-    return (
-        "<div class='controls'>"
-        "<div class='search'><input id='q' type='search' placeholder='Filter by host, title, or URL' autocomplete='off' /></div>"
-        "<div class='hint'>Type to filter the list</div>"
-        "</div>"
-        "<div class='table-wrap'>"
-        "<table>"
-        "<thead><tr><th>#</th><th>URL</th><th>Host</th><th>Path</th></tr></thead>"
-        "<tbody>"
-        + "".join(rows)
-        + "</tbody></table></div>"
-        "<script>"
-        "const q=document.getElementById('q');"
-        "function norm(s){return (s||'').toLowerCase();}"
-        "q.addEventListener('input',()=>{"
-        "const v=norm(q.value);"
-        "const rows=[...document.querySelectorAll('tr.data-row')];"
-        "for(const r of rows){"
-        "const txt=norm(r.innerText);"
-        "const show = !v || txt.includes(v);"
-        "r.style.display = show ? '' : 'none';"
-        "let nxt=r.nextElementSibling;"
-        "if(nxt && nxt.classList.contains('meta-row')) nxt.style.display = show ? '' : 'none';"
-        "}"
-        "});"
-        "</script>"
-    )
+        r = pre.get(u) or _preescape_one(u, {})
+        add(_ROW_OPEN)
+        add(str(idx))
+        add(_ROW_URL)
+        add(r["esc_u"])
+        add(_ROW_URL_TEXT)
+        add(r["esc_u"])
+        add(_ROW_HOST)
+        add(r["esc_host"])
+        add(_ROW_PATH)
+        add(r["esc_path"])
+        add(_ROW_CLOSE)
+
+        if not r["has_meta"]:
+            continue
+        add(_META_OPEN)
+        add(r["esc_title"])
+        add(_META_SUMM)
+        add(r["esc_summ"])
+        add("</div>")
+        add(r["chips"])
+        add(_META_EXTRA)
+        add(r["esc_kind"])
+        if r["esc_fetched"]:
+            add(" | ")
+            add(r["esc_fetched"])
+        add(_META_CLOSE)
+    parts.append(_table_tail(rel_prefix))
+    return "".join(parts)
 
 # ---------------------------
 # Page builders
 # ---------------------------
-def build_main_pages(history: list[tuple[str, str]], input_urls: list[str], enrich: dict[str, dict], site_blurb: dict, built_utc: str):
+@functools.lru_cache(maxsize=8)
+def _day_page_shared(built_utc: str, blurb: str) -> tuple[str, str]:
+    # the part of a daily page after the URL count badge up to the table, and the tail
+    middle = (
+        f"<span class='badge'>Built: <strong style='color:var(--text)'>{esc(built_utc)} UTC</strong></span>"
+        f"<span class='badge'><a href='{_ESC_ALL_URL}'>all.html</a></span>"
+        f"<span class='badge'><a href='{_ESC_HOME_URL}'>home</a></span>"
+        f"<span class='badge'><a href='{_ESC_SITEMAP_URL}'>sitemap.xml</a></span>"
+        f"<span class='badge'><a href='{_ESC_RSS_URL}'>rss.xml</a></span>"
+        "</div>"
+        f"<div class='blurb'>{esc(blurb)}</div>"
+    )
+    tail = (
+        "<div class='footer'>Generated from <code>data/daily.csv</code> and stored in <code>data/history.csv</code>.</div>"
+        "</div></div></body></html>"
+    )
+    return middle, tail
+
+def render_day_page(day: str, day_urls: list[str], pre: dict[str, dict], site_blurb: dict, built_utc: str) -> tuple[Path, tuple[str, str]]:
+    # daily list based on first-seen, but display order varies per deployment
+    day_unique = dedupe_preserve_order(day_urls)
+    day_display = shuffle_for_site(day_unique, f"day-display-{day}")
+    title = f"{SITE_NAME} {day}"
+    # schema reuses the display permutation; ordering only needs to vary per deployment
+    schema = itemlist_schema(title, day_display, built_utc)
+    head = render_head(
+        title,
+        abs_url(f"/d/{day}.html"),
+        site_blurb.get("meta_description") or "",
+        schema,
+        rel_prefix="../",
+    )
+    middle, tail = _day_page_shared(built_utc, site_blurb.get("blurb") or "")
+    body = "".join(
+        [
+            "<body><div class='wrap'><div class='card'>",
+            f"<div class='topbar'><h1>{esc(title)}</h1><div class='subtle'>{_ESC_SITE_VARIANT}</div></div>",
+            "<div class='meta'>",
+            f"<span class='badge'>URLs: <strong style='color:var(--text)'>{len(day_unique)}</strong></span>",
+            middle,
+            render_table(day_display, pre, rel_prefix="../"),
+            tail,
+        ]
+    )
+    return DAILY_DIR / f"{day}.html", (head, body)
+
+_WORKER_PRE: dict[str, dict] = {}
+
+def _init_render_worker(pre_blob: bytes):
+    global _WORKER_PRE
+    _WORKER_PRE = pickle.loads(pre_blob)
+
+def _render_day_task(day: str, day_urls: list[str], site_blurb: dict, built_utc: str) -> tuple[Path, tuple[str, str]]:
+    return render_day_page(day, day_urls, _WORKER_PRE, site_blurb, built_utc)
+
+def build_main_pages(grouped: dict[str, list[str]], all_urls_unique: list[str], input_urls: list[str], enrich: dict[str, dict], site_blurb: dict, built_utc: str) -> tuple[list[str], dict[str, str]]:
+    # returns the days whose page was (re)written this build, and when each day page
+    # was last rendered (BUILD_UTC_ISO format; absent when not known)
     today = utc_today_iso()
-    grouped = group_by_date(history)
     today_urls = grouped.get(today, [])
 
     # Variation: different ordering per page and per cloud
-    all_urls_unique = dedupe_preserve_order([u for _, u in history])
     all_for_display = shuffle_for_site(all_urls_unique, "all-display")[:MAX_ALL_LIST]
     index_for_display = shuffle_for_site(all_urls_unique, "index-display")[:MAX_ALL_LIST]
+    pre = preescape_enrich(all_urls_unique, enrich)
 
     # For daily pages, shuffle but keep within that day
     today_display = shuffle_for_site(list(today_urls), f"day-display-{today}")
 
     # Featured selection (varies by cloud + site)
     featured = pick_featured(all_urls_unique, 6, f"featured-{today}")
-    featured_cards = render_feature_cards(featured, enrich)
+    featured_cards = render_feature_cards(featured, pre)
 
     # Stats
     hosts = set()
@@ -1065,26 +1623,28 @@ def build_main_pages(history: list[tuple[str, str]], input_urls: list[str], enri
         site_blurb.get("meta_description") or "",
         idx_schema,
     )
-    idx_body = (
-        "<body><div class='wrap'><div class='card'>"
-        + render_top_meta(url_count, built_utc, today_page_path, BASE_URL)
-        + f"<div class='blurb'>{esc(site_blurb.get('blurb') or '')}</div>"
-        + "<div class='grid'>"
-        + "<div class='panel'>"
-        + "<h2>Snapshot</h2>"
-        + "<div class='stats'>"
-        + f"<div class='stat'><strong>{url_count}</strong> URLs</div>"
-        + f"<div class='stat'><strong>{host_count}</strong> unique hosts</div>"
-        + f"<div class='stat'>Build label: <strong>{esc(SITE_VARIANT or 'site')}</strong></div>"
-        + "</div>"
-        + featured_cards
-        + "</div>"
-        + "</div>"
-        + render_table(index_for_display, enrich)
-        + "<div class='footer'>Generated from <code>data/daily.csv</code> and stored in <code>data/history.csv</code>.</div>"
-        + "</div></div></body></html>"
+    idx_body = "".join(
+        [
+            "<body><div class='wrap'><div class='card'>",
+            render_top_meta(url_count, built_utc, today_page_path, BASE_URL),
+            f"<div class='blurb'>{esc(site_blurb.get('blurb') or '')}</div>",
+            "<div class='grid'>",
+            "<div class='panel'>",
+            "<h2>Snapshot</h2>",
+            "<div class='stats'>",
+            f"<div class='stat'><strong>{url_count}</strong> URLs</div>",
+            f"<div class='stat'><strong>{host_count}</strong> unique hosts</div>",
+            f"<div class='stat'>Build label: <strong>{esc(SITE_VARIANT or 'site')}</strong></div>",
+            "</div>",
+            featured_cards,
+            "</div>",
+            "</div>",
+            render_table(index_for_display, pre),
+            "<div class='footer'>Generated from <code>data/daily.csv</code> and stored in <code>data/history.csv</code>.</div>",
+            "</div></div></body></html>",
+        ]
     )
-    write_text(DOCS_DIR / "index.html", idx_head + idx_body)
+    write_parts(DOCS_DIR / "index.html", (idx_head, idx_body))
 
     # all.html
     all_schema_urls = shuffle_for_site(list(all_for_display), "all-schema")
@@ -1095,65 +1655,85 @@ def build_main_pages(history: list[tuple[str, str]], input_urls: list[str], enri
         site_blurb.get("meta_description") or "",
         all_schema,
     )
-    all_body = (
-        "<body><div class='wrap'><div class='card'>"
-        + f"<div class='topbar'><h1>{esc(SITE_NAME)}</h1><div class='subtle'>{esc(SITE_VARIANT or '')}</div></div>"
-        + "<div class='meta'>"
-        + f"<span class='badge'>URLs: <strong style='color:var(--text)'>{url_count}</strong></span>"
-        + f"<span class='badge'>Built: <strong style='color:var(--text)'>{esc(built_utc)} UTC</strong></span>"
-        + f"<span class='badge'><a href='{esc(abs_url('/' + today_page_path))}'>{esc(today_page_path)}</a></span>"
-        + f"<span class='badge'><a href='{esc(abs_url('/'))}'>home</a></span>"
-        + f"<span class='badge'><a href='{esc(abs_url('/sitemap.xml'))}'>sitemap.xml</a></span>"
-        + f"<span class='badge'><a href='{esc(abs_url('/rss.xml'))}'>rss.xml</a></span>"
-        + "</div>"
-        + f"<div class='blurb'>{esc(site_blurb.get('blurb') or '')}</div>"
-        + render_table(all_for_display, enrich)
-        + "<div class='footer'>Full list view (display order varies by deployment).</div>"
-        + "</div></div></body></html>"
+    all_body = "".join(
+        [
+            "<body><div class='wrap'><div class='card'>",
+            f"<div class='topbar'><h1>{_ESC_SITE_NAME}</h1><div class='subtle'>{_ESC_SITE_VARIANT}</div></div>",
+            "<div class='meta'>",
+            f"<span class='badge'>URLs: <strong style='color:var(--text)'>{url_count}</strong></span>",
+            f"<span class='badge'>Built: <strong style='color:var(--text)'>{esc(built_utc)} UTC</strong></span>",
+            f"<span class='badge'><a href='{esc(abs_url('/' + today_page_path))}'>{esc(today_page_path)}</a></span>",
+            f"<span class='badge'><a href='{_ESC_HOME_URL}'>home</a></span>",
+            f"<span class='badge'><a href='{_ESC_SITEMAP_URL}'>sitemap.xml</a></span>",
+            f"<span class='badge'><a href='{_ESC_RSS_URL}'>rss.xml</a></span>",
+            "</div>",
+            f"<div class='blurb'>{esc(site_blurb.get('blurb') or '')}</div>",
+            render_table(all_for_display, pre),
+            "<div class='footer'>Full list view (display order varies by deployment).</div>",
+            "</div></div></body></html>",
+        ]
     )
-    write_text(DOCS_DIR / "all.html", all_head + all_body)
-
-    # daily pages
+    write_parts(DOCS_DIR / "all.html", (all_head, all_body))
+
+    # daily pages: skip days whose inputs are unchanged and whose file still exists
+    day_hashes = _load_day_hashes()
+    hash_items = day_hashes.get("items")
+    if not isinstance(hash_items, dict):
+        hash_items = {}
+        day_hashes["items"] = hash_items
+    rendered_items = day_hashes.get("rendered")
+    if not isinstance(rendered_items, dict):
+        rendered_items = {}
+        day_hashes["rendered"] = rendered_items
+    site_key = (BASE_URL or "").strip() or (SITE_VARIANT or "local")
+    known = hash_items.get(site_key) or {}
+    known_rendered = rendered_items.get(site_key) or {}
+
+    fresh: dict[str, str] = {}
+    pending: list[tuple[str, list[str]]] = []
     for day, day_urls in grouped.items():
-        # daily list based on first-seen, but display order varies per deployment
-        day_unique = dedupe_preserve_order(day_urls)
-        day_display = shuffle_for_site(list(day_unique), f"day-display-{day}")
-        title = f"{SITE_NAME} {day}"
-        schema_urls = shuffle_for_site(list(day_display), f"day-schema-{day}")
-        schema = itemlist_schema(title, schema_urls, built_utc)
-        head = render_head(
-            title,
-            abs_url(f"/d/{day}.html"),
-            site_blurb.get("meta_description") or "",
-            schema,
-        )
-        body = (
-            "<body><div class='wrap'><div class='card'>"
-            + f"<div class='topbar'><h1>{esc(title)}</h1><div class='subtle'>{esc(SITE_VARIANT or '')}</div></div>"
-            + "<div class='meta'>"
-            + f"<span class='badge'>URLs: <strong style='color:var(--text)'>{len(day_unique)}</strong></span>"
-            + f"<span class='badge'>Built: <strong style='color:var(--text)'>{esc(built_utc)} UTC</strong></span>"
-            + f"<span class='badge'><a href='{esc(abs_url('/all.html'))}'>all.html</a></span>"
-            + f"<span class='badge'><a href='{esc(abs_url('/'))}'>home</a></span>"
-            + f"<span class='badge'><a href='{esc(abs_url('/sitemap.xml'))}'>sitemap.xml</a></span>"
-            + f"<span class='badge'><a href='{esc(abs_url('/rss.xml'))}'>rss.xml</a></span>"
-            + "</div>"
-            + f"<div class='blurb'>{esc(site_blurb.get('blurb') or '')}</div>"
-            + render_table(day_display, enrich)
-            + "<div class='footer'>Generated from <code>data/daily.csv</code> and stored in <code>data/history.csv</code>.</div>"
-            + "</div></div></body></html>"
-        )
-        write_text(DAILY_DIR / f"{day}.html", head + body)
+        fresh[day] = day_page_hash(day, day_urls, enrich, site_blurb)
+        if known.get(day) == fresh[day] and (DAILY_DIR / f"{day}.html").exists():
+            continue
+        pending.append((day, day_urls))
+
+    # daily pages are independent of each other, so render them across processes
+    # once there are enough to pay for the pool; files are written here either way
+    if RENDER_WORKERS > 1 and len(pending) >= RENDER_PARALLEL_MIN_DAYS:
+        # pre goes to each worker once via the initializer, not with every task
+        pre_blob = pickle.dumps(pre, protocol=pickle.HIGHEST_PROTOCOL)
+        with ProcessPoolExecutor(
+            max_workers=RENDER_WORKERS,
+            initializer=_init_render_worker,
+            initargs=(pre_blob,),
+        ) as ex:
+            futures = [
+                ex.submit(_render_day_task, day, day_urls, site_blurb, built_utc)
+                for day, day_urls in pending
+            ]
+            for f in as_completed(futures):
+                write_parts(*f.result())
+    else:
+        for day, day_urls in pending:
+            write_parts(*render_day_page(day, day_urls, pre, site_blurb, built_utc))
+
+    written = [day for day, _ in pending]
+    rendered = {day: known_rendered[day] for day in fresh if day in known_rendered}
+    rendered.update((day, BUILD_UTC_ISO) for day in written)
+    if fresh != known or rendered != known_rendered:
+        hash_items[site_key] = fresh
+        rendered_items[site_key] = rendered
+        _save_day_hashes(day_hashes)
+    return written, rendered
 
 def build_static_pages(site_blurb: dict, built_utc: str):
-    about_schema = json.dumps(
+    about_schema = _JSON.encode(
         {
             "@context": "https://schema.org",
             "@type": "AboutPage",
             "name": f"About {SITE_NAME}",
             "url": abs_url("/about.html"),
-        },
-        ensure_ascii=False,
+        }
     )
     head = render_head(
         f"About | {SITE_NAME}",
@@ -1164,7 +1744,7 @@ def build_static_pages(site_blurb: dict, built_utc: str):
     repo_line = f"<div class='stat'>Source: <a href='{esc(REPO_URL)}' target='_blank' rel='noopener'>{esc(REPO_URL)}</a></div>" if REPO_URL else ""
     body = (
         "<body><div class='wrap'><div class='card'>"
-        f"<div class='topbar'><h1>About</h1><div class='subtle'>{esc(SITE_VARIANT or '')}</div></div>"
+        f"<div class='topbar'><h1>About</h1><div class='subtle'>{_ESC_SITE_VARIANT}</div></div>"
         f"<div class='blurb'>{esc(site_blurb.get('blurb') or '')}</div>"
         "<div class='panel'>"
         "<h2>What this hub does</h2>"
@@ -1179,19 +1759,18 @@ def build_static_pages(site_blurb: dict, built_utc: str):
         "<h2>Notes</h2>"
         "<div class='u-summ'>Links point to third party pages. Titles and summaries are taken from public page signals when available.</div>"
         "</div>"
-        "<div class='footer'><a href='" + esc(abs_url("/")) + "'>Back to home</a></div>"
+        f"<div class='footer'><a href='{_ESC_HOME_URL}'>Back to home</a></div>"
         "</div></div></body></html>"
     )
-    write_text(DOCS_DIR / "about.html", head + body)
+    write_parts(DOCS_DIR / "about.html", (head, body))
 
-    status_schema = json.dumps(
+    status_schema = _JSON.encode(
         {
             "@context": "https://schema.org",
             "@type": "WebPage",
             "name": f"Status | {SITE_NAME}",
             "url": abs_url("/status.html"),
-        },
-        ensure_ascii=False,
+        }
     )
     head2 = render_head(
         f"Status | {SITE_NAME}",
@@ -1201,7 +1780,7 @@ def build_static_pages(site_blurb: dict, built_utc: str):
     )
     body2 = (
         "<body><div class='wrap'><div class='card'>"
-        f"<div class='topbar'><h1>Status</h1><div class='subtle'>{esc(SITE_VARIANT or '')}</div></div>"
+        f"<div class='topbar'><h1>Status</h1><div class='subtle'>{_ESC_SITE_VARIANT}</div></div>"
         "<div class='panel'>"
         "<h2>Build information</h2>"
         "<div class='stats'>"
@@ -1212,77 +1791,106 @@ def build_static_pages(site_blurb: dict, built_utc: str):
         "</div>"
         "<div class='panel'>"
         "<h2>Files</h2>"
-        "<div class='u-summ'>home, all, daily pages, sitemap, RSS, robots, and IndexNow key file (if enabled).</div>"
+        "<div class='u-summ'>home, all, daily pages, filter script, sitemap, RSS, robots, and IndexNow key file (if enabled).</div>"
         "</div>"
-        "<div class='footer'><a href='" + esc(abs_url("/")) + "'>Back to home</a></div>"
+        f"<div class='footer'><a href='{_ESC_HOME_URL}'>Back to home</a></div>"
         "</div></div></body></html>"
     )
-    write_text(DOCS_DIR / "status.html", head2 + body2)
+    write_parts(DOCS_DIR / "status.html", (head2, body2))
+
+def build_filter_js():
+    write_text(DOCS_DIR / "filter.js", FILTER_JS)
+
+def build_styles_css():
+    # shared stylesheet, linked from every page instead of inlined
+    write_text(DOCS_DIR / "styles.css", page_css())
 
 def build_robots():
     sitemap_url = abs_url("/sitemap.xml")
     content = "User-agent: *\nAllow: /\nSitemap: " + sitemap_url + "\n"
     write_text(DOCS_DIR / "robots.txt", content)
 
-def build_sitemap(page_urls: list[str], built_utc: str):
-    # sitemap contains only local pages, not external links
-    items = []
-    for u in page_urls:
-        loc = xml_escape(u)
-        items.append(f"<url><loc>{loc}</loc><lastmod>{built_utc}Z</lastmod></url>")
-    xml = (
-        "<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n"
-        "<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\">\n"
-        + "\n".join(items)
-        + "\n</urlset>\n"
+def _xml_lines(header: str, items, footer: str):
+    # same layout as header + "\n".join(items) + footer, without building the list
+    yield header
+    sep = ""
+    for item in items:
+        yield sep
+        yield item
+        sep = "\n"
+    yield footer
+
+def _sitemap_entry(u: str, lastmod: str) -> str:
+    if not lastmod:
+        return f"<url><loc>{xml_escape(u)}</loc></url>"
+    return f"<url><loc>{xml_escape(u)}</loc><lastmod>{lastmod}Z</lastmod></url>"
+
+def build_sitemap(page_urls: list[str], built_utc: str, day_pages: list[tuple[str, str]]):
+    # sitemap contains only local pages, not external links; the top-level pages are
+    # rebuilt every run, while a day page carries the time it was last rendered
+    tail = f"</loc><lastmod>{built_utc}Z</lastmod></url>"
+    items = itertools.chain(
+        (f"<url><loc>{xml_escape(u)}{tail}" for u in page_urls),
+        (_sitemap_entry(u, lastmod) for u, lastmod in day_pages),
+    )
+    stream_write(
+        DOCS_DIR / "sitemap.xml",
+        _xml_lines(
+            "<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n"
+            "<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\">\n",
+            items,
+            "\n</urlset>\n",
+        ),
+    )
+
+def _rss_item(u: str, built_rfc2822: str) -> str:
+    esc_u = xml_escape(u)
+    return (
+        "<item>"
+        f"<title>{esc_u}</title>"
+        f"<link>{esc_u}</link>"
+        f"<guid isPermaLink='true'>{esc_u}</guid>"
+        f"<pubDate>{built_rfc2822}</pubDate>"
+        f"<description>{esc_u}</description>"
+        "</item>"
     )
-    write_text(DOCS_DIR / "sitemap.xml", xml)
 
 def build_rss(external_urls: list[str], built_rfc2822: str):
     # RSS for external URLs (recent first)
-    items = []
-    for u in external_urls[:MAX_RSS_ITEMS]:
-        esc_u = xml_escape(u)
-        items.append(
-            "<item>"
-            f"<title>{esc_u}</title>"
-            f"<link>{esc_u}</link>"
-            f"<guid isPermaLink='true'>{esc_u}</guid>"
-            f"<pubDate>{built_rfc2822}</pubDate>"
-            f"<description>{esc_u}</description>"
-            "</item>"
-        )
-
-    xml = (
-        "<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n"
-        "<rss version='2.0'>\n"
-        "<channel>\n"
-        f"<title>{xml_escape(SITE_NAME)} Feed</title>\n"
-        f"<link>{xml_escape(abs_url('/all.html'))}</link>\n"
-        "<description>Recent URLs added</description>\n"
-        f"<lastBuildDate>{built_rfc2822}</lastBuildDate>\n"
-        + "\n".join(items)
-        + "\n</channel>\n</rss>\n"
+    items = (_rss_item(u, built_rfc2822) for u in external_urls[:MAX_RSS_ITEMS])
+    stream_write(
+        DOCS_DIR / "rss.xml",
+        _xml_lines(
+            "<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n"
+            "<rss version='2.0'>\n"
+            "<channel>\n"
+            f"<title>{xml_escape(SITE_NAME)} Feed</title>\n"
+            f"<link>{xml_escape(abs_url('/all.html'))}</link>\n"
+            "<description>Recent URLs added</description>\n"
+            f"<lastBuildDate>{built_rfc2822}</lastBuildDate>\n",
+            items,
+            "\n</channel>\n</rss>\n",
+        ),
     )
-    write_text(DOCS_DIR / "rss.xml", xml)
 
 def build_backlink_feed(external_urls: list[str], built_utc: str):
     # lightweight XML file ping target (kept simple)
-    items = []
-    for u in external_urls[:MAX_RSS_ITEMS]:
-        items.append(f"<link>{xml_escape(u)}</link>")
-    xml = (
-        "<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n"
-        "<links>\n"
-        f"<updated>{xml_escape(built_utc)}Z</updated>\n"
-        + "\n".join(items)
-        + "\n</links>\n"
+    items = (f"<link>{xml_escape(u)}</link>" for u in external_urls[:MAX_RSS_ITEMS])
+    stream_write(
+        DOCS_DIR / "backlink-feed.xml",
+        _xml_lines(
+            "<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n"
+            "<links>\n"
+            f"<updated>{xml_escape(built_utc)}Z</updated>\n",
+            items,
+            "\n</links>\n",
+        ),
     )
-    write_text(DOCS_DIR / "backlink-feed.xml", xml)
 
 # ---------------------------
 # IndexNow + Pingomatic
 # ---------------------------
+@functools.lru_cache(maxsize=1)
 def ensure_indexnow_key() -> str:
     if INDEXNOW_KEY_FILE.exists():
         k = INDEXNOW_KEY_FILE.read_text(encoding="utf-8", errors="ignore").strip()
@@ -1314,6 +1922,9 @@ def submit_indexnow(site_pages: list[str]):
     if not host:
         return
 
+    if not site_pages:
+        return
+
     key_location = abs_url(f"/{key}.txt")
     payload = {
         "host": host,
@@ -1348,25 +1959,29 @@ def main():
     ensure_dirs()
     ensure_nojekyll()
 
-    built_utc = dt.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
-    built_iso_z = utc_now_iso_z().replace("T", " ").replace("Z", "")
-    built_rfc = utc_now_rfc2822()
+    built_utc = BUILD_UTC_DISPLAY
+    built_rfc = BUILD_UTC_RFC2822
 
     # Load input, update history
     input_urls = dedupe_preserve_order(read_input_urls())
     today = utc_today_iso()
     history = update_history_with_today(input_urls, today)
 
-    # Enrich URLs (uses cache)
+    # one pass each over history, shared by enrichment, pages, sitemap and feeds
     all_urls_unique = dedupe_preserve_order([u for _, u in history])
+    grouped = group_by_date(history)
+
+    # Enrich URLs (uses cache)
     enrich = enrich_urls(all_urls_unique)
 
     # Site blurb (per BASE_URL)
     site_blurb = get_site_blurb()
 
     # Pages
-    build_main_pages(history, input_urls, enrich, site_blurb, built_iso_z)
-    build_static_pages(site_blurb, built_iso_z)
+    written_days, day_rendered = build_main_pages(grouped, all_urls_unique, input_urls, enrich, site_blurb, built_utc)
+    build_static_pages(site_blurb, built_utc)
+    build_filter_js()
+    build_styles_css()
     build_robots()
 
     # Local pages list for sitemap + indexnow
@@ -1381,23 +1996,29 @@ def main():
     local_pages.append(abs_url("/status.html"))
     local_pages.append(abs_url("/backlink-feed.xml"))
 
-    # daily pages
-    grouped = group_by_date(history)
-    for day in grouped.keys():
-        local_pages.append(abs_url(f"/d/{day}.html"))
+    # unchanged daily pages were not rewritten, so IndexNow only hears about new ones
+    changed_pages = list(local_pages)
+    changed_pages.extend(abs_url(f"/d/{day}.html") for day in written_days)
+
+    # Broadcast in the background; the pings only name URLs, so they can overlap the
+    # sitemap/feed writes and each other instead of adding their timeouts end to end
+    with ThreadPoolExecutor(max_workers=2) as broadcast:
+        pings = [broadcast.submit(submit_indexnow, changed_pages), broadcast.submit(ping_pingomatic)]
+
+        # daily pages keep the lastmod of their last render, not this build's time
+        day_pages = [(abs_url(f"/d/{day}.html"), day_rendered.get(day, "")) for day in grouped.keys()]
 
-    # sitemap uses ISO Z time
-    built_lastmod = utc_now_iso_z()
-    build_sitemap(local_pages, built_lastmod.replace("Z", ""))
+        # sitemap uses ISO Z time
+        build_sitemap(local_pages, BUILD_UTC_ISO, day_pages)
 
-    # RSS + backlink feed use external urls
-    recent_external = list(reversed(all_urls_unique))  # newest last in history, reverse => newest first
-    build_rss(recent_external, built_rfc)
-    build_backlink_feed(recent_external, built_lastmod.replace("Z", ""))
+        # RSS + backlink feed use external urls
+        # newest last in history; only the first MAX_RSS_ITEMS newest are ever emitted
+        recent_external = list(itertools.islice(reversed(all_urls_unique), MAX_RSS_ITEMS))
+        build_rss(recent_external, built_rfc)
+        build_backlink_feed(recent_external, BUILD_UTC_ISO)
 
-    # Broadcast
-    submit_indexnow(local_pages)
-    ping_pingomatic()
+        for f in pings:
+            f.result()
 
 if __name__ == "__main__":
     main()